@@ -11,12 +11,84 @@ def _get_ffmpeg():
 
 import re
 import concurrent.futures
+import posixpath
+from operator import itemgetter
+from urllib.parse import urlparse
 
 from utils.models import *
 from utils.utils import create_temp_filename, download_to_temp, silentremove
 from .soundcloud_api import SoundCloudWebAPI
 
 
+# codec_XXXk (bitrate) or codec_X[_Y] (bitrate or quality level), e.g. aac_256k, mp3_128, opus_0_0
+_PRESET_RE = re.compile(r'^(?P<codec>[a-z0-9]+)_(?:(?P<kbps>\d+)k|(?P<q>\d+)(?:_\d+)?)$')
+_HLS_RE = re.compile(r'/hls|\.m3u8|ctr-encrypted-hls|cbc-encrypted-hls', re.IGNORECASE)
+_ENC_HLS_RE = re.compile(r'(?:ctr|cbc)-encrypted-hls', re.IGNORECASE)
+_PREMIUM_PLAN_RE = re.compile(r'high|go\+|premium', re.IGNORECASE)
+# Artist separators: ' & ', ' and ', ' x ' and ', '
+_ARTIST_SPLIT_RE = re.compile(r' (?:&|and|x) |, ')
+# Direct download file extensions that map unambiguously to a codec (same names the Content-Type sniffing yields)
+_DOWNLOAD_EXTENSION_CODECS = {'.mp3': 'MP3', '.flac': 'FLAC', '.wav': 'WAV', '.ogg': 'VORBIS'}
+
+_STR_TO_CODEC = dict(CodecEnum.__members__) # includes any alias names, like CodecEnum[...]
+# Codec preference for tie-breaking (higher is better)
+# Prefer HLS slightly if quality is identical
+_CODEC_PREFERENCE = {
+    (CodecEnum.AAC, True): 5,  # HLS AAC
+    (CodecEnum.OPUS, True): 4, # HLS Opus
+    (CodecEnum.OPUS, False): 3,# Progressive Opus
+    (CodecEnum.AAC, False): 2, # Progressive AAC
+    (CodecEnum.MP3, False): 1, # Progressive MP3
+    (CodecEnum.MP3, True): 0,  # HLS MP3 (less common, lower preference)
+}
+_MAX_CODEC_PREFERENCE = max(_CODEC_PREFERENCE.values())
+# Highest bitrate SoundCloud serves (Go+ HLS aac_256k); a stream at this level with top preference can't be beaten
+_MAX_STREAM_KBPS = 256
+
+# Search result cover/artwork sources per query type, tried in order
+# For playlists/albums: 1. own artwork_url, 2. calculated_artwork_url (auto-generated from tracks), 3. first track's artwork
+# (if tracks are included in search results). We DON'T fall back to user avatar for playlists - that shows a generic person icon.
+_PLAYLIST_IMAGE_PATHS = (('artwork_url',), ('calculated_artwork_url',), ('tracks', 0, 'artwork_url'))
+_SEARCH_IMAGE_PATHS = {
+    'users': (('avatar_url',),), # For artists, use avatar
+    'playlists_without_albums': _PLAYLIST_IMAGE_PATHS,
+    'albums': _PLAYLIST_IMAGE_PATHS,
+    'tracks': (('artwork_url',), ('user', 'avatar_url')), # For tracks, use artwork or fallback to user avatar
+}
+
+
+def _first_truthy(data, paths):
+    """Return the first truthy value found by walking each key path (dict keys/list indices) into data."""
+    for path in paths:
+        value = data
+        try:
+            for key in path:
+                value = value[key]
+        except (KeyError, IndexError, TypeError):
+            continue
+        if value:
+            return value
+    return None
+
+
+def _parse_preset(preset_string):
+    """Split a transcoding preset like 'aac_256k' or 'mp3_1_0' into (codec_name, kbps, quality_level) in one pass.
+
+    kbps/quality_level are None when the preset doesn't carry them (e.g. 'aac_hq', 'opus_abr_hq').
+    """
+    match = _PRESET_RE.match(preset_string)
+    if not match:
+        return preset_string.partition('_')[0].upper(), None, None
+    kbps, quality_level = match.group('kbps', 'q')
+    return match.group('codec').upper(), int(kbps) if kbps else None, int(quality_level) if quality_level else None
+
+
+def _artwork_size(artwork_url, size):
+    """Swap the '-large' size token of a SoundCloud artwork URL for another size (e.g. '-original')."""
+    i = artwork_url.rfind('-large')
+    return artwork_url if i < 0 else artwork_url[:i] + size + artwork_url[i + 6:]
+
+
 module_information = ModuleInformation(
     service_name = 'SoundCloud',
     module_supported_modes = ModuleModes.download,
@@ -68,10 +140,26 @@ class ModuleInterface:
         else:
             self.plan = 'Free'
 
-        self.artists_split = lambda artists_string: artists_string.replace(' & ', ', ').replace(' and ', ', ').replace(' x ', ', ').split(', ')
-        self.artwork_url_format = lambda artwork_url: artwork_url.replace('-large', '-original') if artwork_url else None
+        self._auth_header = None
+        self._auth_token_cached = None
+
+        # (data dict, {track_id: track_number}) for the tracklist currently being processed
+        self._track_numbers = (None, {})
+
+        self.artists_split = _ARTIST_SPLIT_RE.split
+        self.artwork_url_format = lambda artwork_url: _artwork_size(artwork_url, '-original') if artwork_url else None
     
 
+    @property
+    def auth_header(self):
+        # Rebuilt only when the web session's access token changes
+        access_token = self.websession.access_token
+        if self._auth_header is None or self._auth_token_cached != access_token:
+            self._auth_header = {'Authorization': f'OAuth {access_token}'}
+            self._auth_token_cached = access_token
+        return self._auth_header
+
+
     @staticmethod
     def get_release_year(data):
         release_date = ''
@@ -81,7 +169,16 @@ class ModuleInterface:
             release_date = data['display_date']
         elif 'created_at' in data and data['created_at']:
             release_date = data['created_at']
-        return int(release_date.split('-')[0])
+        return int(release_date.partition('-')[0])
+
+
+    def _get_track_number(self, track_id, data):
+        # Album/playlist tracks all share the same data dict, so number its keys once instead of per track
+        numbered_data, track_numbers = self._track_numbers
+        if numbered_data is not data:
+            track_numbers = {key: index for index, key in enumerate(data, 1)}
+            self._track_numbers = (data, track_numbers)
+        return track_numbers.get(track_id, 1)
 
 
     def custom_url_parse(self, link):
@@ -111,31 +208,10 @@ class ModuleInterface:
         results = self.websession.search(qt, query, limit)
         
         search_results = []
+        image_paths = _SEARCH_IMAGE_PATHS[qt]
         for result in results['collection']:
             # Get cover/artwork URL
-            image_url = None
-            if qt == 'users':
-                # For artists, use avatar
-                image_url = result.get('avatar_url')
-            elif qt in ('playlists_without_albums', 'albums'):
-                # For playlists/albums, try multiple sources:
-                # 1. Playlist's own artwork_url
-                # 2. calculated_artwork_url (auto-generated from tracks)
-                # 3. First track's artwork (if tracks are included in search results)
-                # Note: We DON'T fall back to user avatar for playlists - that shows a generic person icon
-                image_url = result.get('artwork_url')
-                if not image_url:
-                    image_url = result.get('calculated_artwork_url')
-                if not image_url:
-                    # Try to get artwork from first track
-                    tracks = result.get('tracks', [])
-                    if tracks and len(tracks) > 0:
-                        first_track = tracks[0]
-                        image_url = first_track.get('artwork_url')
-                # Skip user avatar fallback for playlists - it's just a generic person icon
-            else:
-                # For tracks, use artwork or fallback to user avatar
-                image_url = result.get('artwork_url') or (result.get('user', {}).get('avatar_url') if result.get('user') else None)
+            image_url = _first_truthy(result, image_paths)
             
             # Skip default/placeholder avatar URLs (they show generic person icons)
             if image_url and 'default_avatar' in image_url:
@@ -143,7 +219,7 @@ class ModuleInterface:
             
             # Convert to smaller size for thumbnails (use -t200x200 for search results)
             if image_url:
-                image_url = image_url.replace('-large', '-t200x200')
+                image_url = _artwork_size(image_url, '-t200x200')
             
             # Preview URL for tracks - leave as None, will be lazy-loaded on click
             # SoundCloud requires resolving stream URLs which needs API authentication
@@ -170,11 +246,11 @@ class ModuleInterface:
             # Get year
             year = None
             if result.get('release_date'):
-                year = result['release_date'].split('-')[0]
+                year = result['release_date'].partition('-')[0]
             elif result.get('display_date'):
-                year = result['display_date'].split('-')[0]
+                year = result['display_date'].partition('-')[0]
             elif result.get('created_at'):
-                year = result['created_at'].split('-')[0]
+                year = result['created_at'].partition('-')[0]
             
             # Extract genre for tracks
             if qt == 'tracks' and result.get('genre'):
@@ -201,7 +277,7 @@ class ModuleInterface:
                 
                 def _fetch_sc_track_genre(tid):
                     try:
-                        t_data = self.websession._get(f'tracks/{tid}')
+                        t_data = self.websession.get_track(tid)
                         return tid, t_data.get('genre')
                     except:
                         return tid, None
@@ -260,15 +336,12 @@ class ModuleInterface:
 
         if explicit_is_hls_from_kwargs is True:
             determined_is_hls = True
-        elif isinstance(track_url, str) and \
-             ('/hls' in track_url.lower() or \
-              '.m3u8' in track_url.lower() or \
-              'ctr-encrypted-hls' in track_url.lower()):
+        elif isinstance(track_url, str) and _HLS_RE.search(track_url):
             determined_is_hls = True
         
         is_hls = determined_is_hls
 
-        access_token = self.websession.access_token
+        auth_header = self.auth_header
 
         if is_hls:
             if not track_url:
@@ -289,7 +362,7 @@ class ModuleInterface:
                 # 'f': 'hls', # Usually auto-detected, can be omitted
                 'hide_banner': None,
                 'y': None, 
-                'headers': f'Authorization: OAuth {access_token}\r\n',
+                'headers': f"Authorization: {auth_header['Authorization']}\r\n",
                 'protocol_whitelist': 'http,https,tls,tcp,file,crypto'
             }
             ffmpeg_output_options = {
@@ -299,8 +372,9 @@ class ModuleInterface:
 
             try:
                 _ffmpeg = _get_ffmpeg()
-                process = _ffmpeg.input(m3u8_url_resolved, **ffmpeg_input_options).output(output_location, **ffmpeg_output_options).run_async(pipe_stdout=True, pipe_stderr=True)
-                out, err = process.communicate()
+                process = _ffmpeg.input(m3u8_url_resolved, **ffmpeg_input_options).output(output_location, **ffmpeg_output_options).run_async(pipe_stdout=False, pipe_stderr=True)
+                # Output goes straight to the file, so only stderr is captured (for the error message below)
+                _, err = process.communicate()
 
                 if process.returncode != 0:
                     silentremove(output_location)
@@ -320,7 +394,6 @@ class ModuleInterface:
                 temp_file_path = output_location
             )
         
-        auth_header_non_hls = {"Authorization": f"OAuth {access_token}"}
         if not download_url: 
             resolved_stream_url = self.websession.get_track_stream_link(track_url, track_authorization)
         else:
@@ -328,7 +401,7 @@ class ModuleInterface:
 
         if codec == CodecEnum.AAC:
             extension = codec_data[codec].container.name
-            temp_location = download_to_temp(resolved_stream_url, auth_header_non_hls, extension)
+            temp_location = download_to_temp(resolved_stream_url, auth_header, extension)
             output_location = create_temp_filename() + '.' + extension
             try:
                 _get_ffmpeg().input(temp_location).output(output_location, acodec='copy', loglevel='error').run()
@@ -346,66 +419,44 @@ class ModuleInterface:
             return TrackDownloadInfo(
                 download_type = DownloadEnum.URL,
                 file_url = resolved_stream_url,
-                file_url_headers = auth_header_non_hls
+                file_url_headers = auth_header
             )
 
 
-    def _parse_aac_bitrate_from_preset(self, preset_string):
-        # preset_string is like "aac_256k" or "aac_1_0"
-        if not isinstance(preset_string, str):
-            return 0
-        
-        # Handle aac_XXXk format (e.g., aac_256k)
-        match_kbps = re.search(r'aac_(\d+)k', preset_string)
-        if match_kbps:
-            try:
-                return int(match_kbps.group(1))
-            except ValueError:
-                return 0 # Should not happen if regex matches
-
-        # Handle other aac_ formats like aac_1_0, assign a default quality
-        if preset_string in ['aac_1_0', 'aac_hq']:
-            return 256
-        if preset_string.startswith('aac_'):            
-            return 64 
-
-        return 0 # Default if no clear bitrate is found or format is unexpected
+    def _preset_quality(self, preset_string, stream_codec_name, kbps, quality_level, is_hls):
+        # Scores a preset already split by _parse_preset
+        if is_hls and stream_codec_name == 'AAC':
+            # Handle aac_XXXk format (e.g., aac_256k)
+            if kbps is not None:
+                return kbps
+            # Handle other aac_ formats like aac_1_0, assign a default quality
+            if preset_string in ('aac_1_0', 'aac_hq'):
+                return 256
+            if preset_string.startswith('aac_'):
+                return 64
+            return 0 # Default if no clear bitrate is found or format is unexpected
 
-    def _parse_progressive_bitrate_from_preset(self, preset_string, stream_codec_name):
-        if not isinstance(preset_string, str):
-            return 0
+        # Add parsing for HLS Opus/MP3 bitrates if their presets have them
+        # For now, HLS Opus/MP3 share the progressive scoring below
 
         # Specific SoundCloud Opus presets (these are descriptive, not direct bitrates)
         if stream_codec_name == 'OPUS':
             if 'abr_hq' in preset_string: return 128 # Approximate for high quality Opus
             if 'abr_sq' in preset_string: return 96  # Approximate for standard quality Opus
-        
+
         # Generic pattern for mp3_XXXk or opus_XXXk or aac_XXXk
-        match_kbps = re.search(r'(\d+)k', preset_string)
-        if match_kbps:
-            try: return int(match_kbps.group(1))
-            except ValueError: pass
+        if kbps is not None:
+            return kbps
 
         # Standard generic quality placeholders that don't directly indicate bitrate
-        if preset_string in ['mp3_0_0', 'mp3_0_1', 'mp3_1_0']:
+        if preset_string in ('mp3_0_0', 'mp3_0_1', 'mp3_1_0'):
             return 128
         if preset_string == 'opus_0_0':
             return 64
 
         # Generic pattern for mp3_XXX or opus_XXX or aac_XXX (where XXX is bitrate)
-        parts = preset_string.split('_')
-        if len(parts) > 1 and parts[1].isdigit():
-            try: return int(parts[1])
-            except ValueError: pass
-        
-        # Fallback for Opus quality levels like opus_X_Y (0-10 for X in opusenc)
-        # Scale X to an approximate bitrate range (e.g. X*12 might map 0-10 to 0-120kbps range)
-        if stream_codec_name == 'OPUS' and len(parts) > 1 and parts[0] == 'opus' and parts[1].isdigit():
-            try: 
-                quality_level = int(parts[1])
-                # Simple scaling: maps 0-10 to something in a typical bitrate range                
-                return quality_level * 12 + 32 # e.g. 0->32, 5->92, 8->128, 10->152
-            except ValueError: pass
+        if quality_level is not None:
+            return quality_level
 
         return 0 # Default
 
@@ -414,7 +465,7 @@ class ModuleInterface:
         # If we have no data, OR the data is incomplete (missing 'media' or 'transcodings'), fetch full info.
         # Playlist/Album tracks often come as stubs without the 'media' object or with empty transcodings.
         if not track_data or not track_data.get('media', {}).get('transcodings'):
-            track_data = self.websession._get('tracks/' + str(track_id))
+            track_data = self.websession.get_track(track_id)
         metadata = track_data.get('publisher_metadata') or {}
 
         file_url, download_url, final_codec, error = None, None, CodecEnum.AAC, None
@@ -425,20 +476,23 @@ class ModuleInterface:
         if track_data.get('policy') in ('BLOCK', 'SNIP') and not track_data.get('media', {}).get('transcodings'):
             if not self.websession.access_token:
                 error = "This is a SoundCloud Go+ premium track. Please configure a valid access token in Settings to stream or download it."
-            elif 'high' in str(self.plan).lower() or 'go+' in str(self.plan).lower() or 'premium' in str(self.plan).lower():
+            elif _PREMIUM_PLAN_RE.search(str(self.plan)):
                 error = "This track is currently restricted in your region and cannot be streamed or downloaded even with a Go+ subscription."
             else:
                 error = "This is a SoundCloud Go+ premium track. Your account requires a Go+ subscription to stream or download it."
         elif track_data.get('downloadable') and track_data.get('has_downloads_left'):
             download_url = self.websession.get_track_download(track_id)
-            content_type_header = self.websession.s.head(download_url).headers.get('Content-Type', '')
-            codec_str_part = content_type_header.split('/')[-1]
-            codec_str = codec_str_part.replace('mpeg', 'mp3').replace('ogg', 'vorbis').upper()
-            if codec_str in CodecEnum.__members__:
-                final_codec = CodecEnum[codec_str]
-            else:
-                error = f"Unknown codec from direct download Content-Type: {content_type_header}"
-                final_codec = CodecEnum.AAC # Default
+            # Guess the codec from the file extension first; only ask the server via HEAD when that is ambiguous
+            extension = posixpath.splitext(urlparse(download_url).path)[1].lower()
+            final_codec = _STR_TO_CODEC.get(_DOWNLOAD_EXTENSION_CODECS.get(extension))
+            if final_codec is None:
+                content_type_header = self.websession.s.head(download_url).headers.get('Content-Type', '')
+                codec_str_part = content_type_header.split('/')[-1]
+                codec_str = codec_str_part.replace('mpeg', 'mp3').replace('ogg', 'vorbis').upper()
+                final_codec = _STR_TO_CODEC.get(codec_str)
+                if final_codec is None:
+                    error = f"Unknown codec from direct download Content-Type: {content_type_header}"
+                    final_codec = CodecEnum.AAC # Default
             final_is_hls_stream = False
             # For direct downloads, file_url is not used; download_url is primary.            
             file_url = download_url 
@@ -446,90 +500,51 @@ class ModuleInterface:
         elif track_data['streamable']:
             if track_data['media']['transcodings']:
                 available_streams = []
-                # Codec preference for tie-breaking (higher is better)
-                # Prefer HLS slightly if quality is identical
-                codec_preference = {
-                    (CodecEnum.AAC, True): 5,  # HLS AAC
-                    (CodecEnum.OPUS, True): 4, # HLS Opus
-                    (CodecEnum.OPUS, False): 3,# Progressive Opus
-                    (CodecEnum.AAC, False): 2, # Progressive AAC
-                    (CodecEnum.MP3, False): 1, # Progressive MP3
-                    (CodecEnum.MP3, True): 0,  # HLS MP3 (less common, lower preference)
-                }
 
                 for i in track_data['media']['transcodings']:
                     protocol = i['format']['protocol']
                     preset_string = i['preset']
-                    preset_parts = preset_string.split('_')
-                    stream_codec_name = preset_parts[0].upper() if preset_parts else ''
+                    stream_codec_name, preset_kbps, preset_level = _parse_preset(preset_string)
 
-                    if stream_codec_name in CodecEnum.__members__:
-                        current_codec_enum = CodecEnum[stream_codec_name]
+                    current_codec_enum = _STR_TO_CODEC.get(stream_codec_name)
+                    if current_codec_enum is not None:
                         
                         # Determine if it's an HLS stream more robustly
                         stream_transcoding_url_for_check = i['url']
                         is_hls_by_protocol = (protocol == 'hls')
-                        is_hls_by_url = (isinstance(stream_transcoding_url_for_check, str) and \
-                                         ('/hls' in stream_transcoding_url_for_check.lower() or \
-                                          '.m3u8' in stream_transcoding_url_for_check.lower() or \
-                                          'ctr-encrypted-hls' in stream_transcoding_url_for_check.lower() or \
-                                          'cbc-encrypted-hls' in stream_transcoding_url_for_check.lower()))
+                        is_hls_by_url = isinstance(stream_transcoding_url_for_check, str) and bool(_HLS_RE.search(stream_transcoding_url_for_check))
                         is_hls = is_hls_by_protocol or is_hls_by_url
                         
                         # Determine if it's an ENCRYPTED HLS stream
-                        is_encrypted_hls = False
-                        if is_hls and isinstance(stream_transcoding_url_for_check, str) and \
-                           ('ctr-encrypted-hls' in stream_transcoding_url_for_check.lower() or \
-                            'cbc-encrypted-hls' in stream_transcoding_url_for_check.lower()):
-                            is_encrypted_hls = True
+                        is_encrypted_hls = is_hls and isinstance(stream_transcoding_url_for_check, str) and bool(_ENC_HLS_RE.search(stream_transcoding_url_for_check))
                         # End of new HLS determination logic
                         
-                        quality_score = 0 # Renamed from 'quality'
-
                         if is_encrypted_hls:
                             quality_score = -100 # Heavily penalize encrypted streams
-                        elif is_hls:
-                            if current_codec_enum == CodecEnum.AAC:
-                                quality_score = self._parse_aac_bitrate_from_preset(preset_string)
-                            # Add parsing for HLS Opus/MP3 bitrates if their presets have them
-                            # For now, relying on generic progressive parser or default 0 for other HLS
-                            else: 
-                                quality_score = self._parse_progressive_bitrate_from_preset(preset_string, stream_codec_name)
-                        else: # Progressive
-                            quality_score = self._parse_progressive_bitrate_from_preset(preset_string, stream_codec_name)
+                        else:
+                            quality_score = self._preset_quality(preset_string, stream_codec_name, preset_kbps, preset_level, is_hls)
                         
                         if i['url'] and quality_score >= 0: # Only consider streams with a URL and non-negative quality
-                            pref_score = codec_preference.get((current_codec_enum, is_hls), 0)
-                            available_streams.append({
-                                'url': i['url'],
-                                'codec': current_codec_enum,
-                                'is_hls': is_hls,
-                                'is_encrypted': is_encrypted_hls,
-                                'quality': quality_score,
-                                'preference': pref_score,
-                                'preset': preset_string
-                            })
+                            pref_score = _CODEC_PREFERENCE.get((current_codec_enum, is_hls), 0)
+                            # (quality, preference, url, codec, is_hls, is_encrypted, preset)
+                            available_streams.append((quality_score, pref_score, i['url'], current_codec_enum, is_hls, is_encrypted_hls, preset_string))
+                            if quality_score >= _MAX_STREAM_KBPS and pref_score == _MAX_CODEC_PREFERENCE:
+                                break # Nothing later in the list can rank higher, skip parsing the remaining presets
                 
                 if available_streams:
-                    # Sort: 1. quality (desc), 2. preference score (desc)
-                    available_streams.sort(key=lambda x: (x['quality'], x['preference']), reverse=True)
-                    
-                    best_stream = available_streams[0]
+                    # Pick by 1. quality (desc), 2. preference score (desc); ties keep the first stream listed
+                    best_quality, _, file_url, final_codec, final_is_hls_stream, final_is_encrypted_hls, best_preset = max(available_streams, key=itemgetter(0, 1))
                     # Ensure the best stream has a positive quality, otherwise it might be an undesired low-quality default
                     # Always set these from the best stream found
-                    file_url = best_stream['url']
-                    final_codec = best_stream['codec']
-                    final_is_hls_stream = best_stream['is_hls']
-                    final_is_encrypted_hls = best_stream.get('is_encrypted', False)
                     
                     if final_is_encrypted_hls:
                         error = "Track is available as a DRM-protected HLS stream, which can be downloaded, but aren't playable without decryption key. Skipping."
-                    elif best_stream['quality'] > 0:
+                    elif best_quality > 0:
                         error = None # Clear previous errors if a good stream is found
                     else:
                         # This case means the best found stream had quality 0 or less (e.g. only failed parsing or was encrypted)
                         if not final_is_encrypted_hls: # Don't overwrite specific DRM error
-                            error = f"Best stream found (preset: {best_stream['preset']}) has zero or negative quality, or codec could not be parsed."
+                            error = f"Best stream found (preset: {best_preset}) has zero or negative quality, or codec could not be parsed."
                 else:
                     error = "No stream transcodings found or none were usable."
             else:
@@ -544,10 +559,12 @@ class ModuleInterface:
             except (TypeError, ValueError):
                 pass
         artists_list = self.artists_split(metadata['artist'] if metadata.get('artist') else track_data['user']['username'])
+        # "Artist - Title" uploads: keep the part after the first separator (up to the next one, as before)
+        title_head, title_sep, title_tail = track_data['title'].partition(' - ')
         
         return TrackInfo(
             id = str(track_id),
-            name = track_data['title'].split(' - ')[1] if ' - ' in track_data['title'] else track_data['title'],
+            name = title_tail.partition(' - ')[0] if title_sep else title_head,
             album = metadata.get('album_title'),
             album_id = '',
             artists = artists_list,
@@ -569,8 +586,8 @@ class ModuleInterface:
             error = error,
             tags =  Tags(
                 album_artist = artists_list[0] if artists_list else None,
-                track_number = int(list(data.keys()).index(track_id)) + 1 if data.get(track_id) else 1,
-                release_date = track_data['created_at'].split('T')[0] if track_data.get("created_at") else None,
+                track_number = self._get_track_number(track_id, data) if data.get(track_id) else 1,
+                release_date = track_data['created_at'].partition('T')[0] if track_data.get("created_at") else None,
                 genres = track_data['genre'].split('/') if track_data.get('genre') else None,
                 composer = metadata.get('writer_composer'),
                 copyright = metadata.get('p_line'),
@@ -666,7 +683,7 @@ class ModuleInterface:
             title = a.get('title')
             if title:
                 release_date = a.get('release_date') or a.get('display_date') or a.get('created_at') or ''
-                release_year = release_date.split('-')[0] if release_date else None
+                release_year = release_date.partition('-')[0] if release_date else None
                 
                 # Extract track count and genre
                 track_count = a.get('track_count') or len(a.get('tracks', []))
@@ -680,9 +697,9 @@ class ModuleInterface:
 
                 # Get artwork URL (small thumbnail for artist expansion)
                 cover_url = ''
-                pic = a.get('artwork_url') or (a.get('user', {}).get('avatar_url') if a.get('user') else None)
+                pic = a.get('artwork_url') or ((user := a.get('user')) and user.get('avatar_url'))
                 if pic:
-                    cover_url = pic.replace('-large', '-t50x50') # Smallest size for list expansion
+                    cover_url = _artwork_size(pic, '-t50x50') # Smallest size for list expansion
 
                 albums_out.append({
                     'id': str(aid),
@@ -713,7 +730,7 @@ class ModuleInterface:
                         return aid, {
                             'additional': additional,
                             'duration': a_data.get('duration'),
-                            'year': (a_data.get('release_date') or a_data.get('display_date') or a_data.get('created_at', '')).split('-')[0] or None
+                            'year': (a_data.get('release_date') or a_data.get('display_date') or a_data.get('created_at', '')).partition('-')[0] or None
                         }
                 except: pass
                 return aid, None
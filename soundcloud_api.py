@@ -1,72 +1,254 @@
+try:
+    # orjson parses straight from the response bytes and is much faster on large playlist/collection payloads
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import itemgetter
+from threading import Lock
+from time import monotonic
+from urllib.parse import parse_qsl, urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from utils.utils import create_requests_session
 
 
+_OK_STATUSES = frozenset({200, 201, 202})
+# Parallel requests per fan-out (page batches, tracklist chunks). The keep-alive pool is sized so that even the
+# albums + tracks fan-outs running side by side, plus the interface's metadata pools, never wait for a connection
+_MAX_WORKERS = 8
+_POOL_MAXSIZE = 4 * _MAX_WORKERS
+
+
+class _LRUCache:
+    """Small thread-safe LRU mapping with optional expiry (ttl in seconds); the API object is shared by the module's worker threads."""
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires is not None and expires <= monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (monotonic() + self.ttl if self.ttl else None, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
 class SoundCloudWebAPI:
     def __init__(self, access_token, exception):
         self.api_base = 'https://api-v2.soundcloud.com/'
         self.access_token = access_token
         self.exception = exception
         self.client_id = 'WU4bVxk5Df0g5JC8ULzW77Ry7OM10Lyj'
+        self._tracks_by_ids_url = f'{self.api_base}tracks?client_id={self.client_id}&ids='
         self.s = create_requests_session()
-
-
-    def _headers(self):
-        headers = {
+        # Keep-alive pool large enough for the concurrent fetches; transient errors are retried, the final status is left for _get to report
+        self.s.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_MAXSIZE, max_retries=Retry(
+            total=5, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']), raise_on_status=False
+        )))
+        # Static browser headers ride on the session; the account's Authorization is only sent with API requests (see access_token)
+        self.s.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.132 Safari/537.36',
             'Origin': 'https://soundcloud.com',
             'Referer': 'https://soundcloud.com/'
-        }
-        if self.access_token:
-            headers['Authorization'] = f'OAuth {self.access_token}'
-        return headers
+        })
+        # Resolved objects carry track_authorization and playlist track lists, so they expire like _track_cache
+        self._resolve_cache = _LRUCache(512, ttl=600)
+        self._uid_cache = {} # permalink -> resolved user id
+        self._track_cache = _LRUCache(4096, ttl=600)
+        # request key -> (ETag, Last-Modified, parsed body) for conditional re-fetches
+        self._conditional_cache = _LRUCache(1024)
+
+
+    @property
+    def access_token(self):
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, access_token):
+        # Per-request headers are built once here instead of on every _get
+        self._access_token = access_token
+        self._cached_headers = {'Authorization': f'OAuth {access_token}'} if access_token else {}
 
     def _get(self, url, params=None):
         params = params if params is not None else {}
         if 'client_id' not in params:
             params['client_id'] = self.client_id
-        headers = self._headers()
-        if url.startswith('http://') or url.startswith('https://'):
+        headers = self._cached_headers
+        is_full_url = url.startswith(('http://', 'https://'))
+
+        # Search results and anything tied to a track_authorization are never revalidated from cache
+        cache_key, cached = None, None
+        if not url.startswith('search/') and 'track_authorization' not in params:
+            cache_key = url if is_full_url else (url, tuple(sorted(params.items())))
+            cached = self._conditional_cache.get(cache_key)
+            if cached:
+                etag, last_modified, _ = cached
+                headers = dict(headers)
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+
+        if is_full_url:
             r = self.s.get(url, headers=headers)
         else:
             r = self.s.get(f'{self.api_base}{url}', params=params, headers=headers)
-        if r.status_code not in [200, 201, 202]:
+        if r.status_code == 304 and cached:
+            return cached[2]
+        if r.status_code not in _OK_STATUSES:
             if r.status_code == 403:
                 raise self.exception("This track is not available (e.g. restricted in your country or disabled for API access).")
             if r.status_code == 401:
+                # Cached track_authorization etc. belong to the rejected credentials
+                self._track_cache.clear()
+                self._resolve_cache.clear()
+                self._uid_cache.clear()
+                self._conditional_cache.clear()
                 raise self.exception(f"Unauthorized (401). This usually means the SoundCloud access token or public client ID is invalid or expired. Response: {r.text}")
             raise self.exception(f'{r.status_code!s}: {r.text}')
-        return r.json()
+        data = json_loads(r.content)
+        if cache_key is not None:
+            etag, last_modified = r.headers.get('ETag'), r.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._conditional_cache.set(cache_key, (etag, last_modified, data))
+        return data
 
-    def _get_collection_paginated(self, url, params=None, max_pages=50):
-        """Fetch a paginated collection; handle both list response and dict with collection/next_href. Follow next_href until no more."""
+    def _get_collection_paginated(self, url, params=None, max_pages=50, out_dict=None, key_fn=itemgetter('id')):
+        """Fetch a paginated collection; handle both list response and dict with collection/next_href. Follow next_href until no more.
+        Returns a list of items, or when out_dict is given, inserts each item under key_fn(item) and returns out_dict."""
         params = params or {}
+        limit = params.get('limit', 200)
         all_items = []
-        page_url = url
-        page_params = params
+        page_url, page_params = self._split_next_href(url) if url.startswith(('http://', 'https://')) else (url, params)
         for _ in range(max_pages):
-            if page_url.startswith('http://') or page_url.startswith('https://'):
-                resp = self._get(page_url)
-                page_url = None
-                page_params = None
-            else:
-                resp = self._get(page_url, page_params)
-                page_url = None
-            if isinstance(resp, list):
-                collection = resp
-                next_href = None
-            elif isinstance(resp, dict):
-                collection = resp.get('collection', [])
-                next_href = resp.get('next_href')
-            else:
-                collection = []
-                next_href = None
-            for i in collection:
-                if isinstance(i, dict) and 'id' in i:
-                    all_items.append(i)
-            if not next_href:
+            collection, next_href = self._collection_page(self._get(page_url, page_params))
+            self._add_items(collection, all_items, out_dict, key_fn)
+            page_offset = page_params.get('offset', 0)
+            page_url, page_params = self._split_next_href(next_href)
+            if self._is_last_page(collection, page_offset, page_params, limit):
                 break
-            page_url = next_href
-        return all_items
+        return all_items if out_dict is None else out_dict
+
+    def _get_collection_concurrent(self, url, params=None, max_pages=50, out_dict=None, key_fn=itemgetter('id')):
+        """Same result as _get_collection_paginated. When next_href pages by a numeric offset, the following pages are fetched in parallel
+        (_MAX_WORKERS at a time, kept in order) instead of one round trip after another.
+        Opaque cursors and next_hrefs outside api_base are followed sequentially."""
+        params = params or {}
+        collection, next_href = self._collection_page(self._get(url, params))
+        all_items = []
+        self._add_items(collection, all_items, out_dict, key_fn)
+        result = all_items if out_dict is None else out_dict
+        next_path, next_query = self._split_next_href(next_href)
+        if max_pages <= 1 or self._is_last_page(collection, params.get('offset', 0), next_query, params.get('limit', 200)):
+            return result
+
+        offset = next_query.get('offset', '')
+        limit = str(next_query.get('limit', params.get('limit', '')))
+        # _get ignores params for full URLs, so a next_href outside api_base can't be re-offset and is followed as-is
+        if next_path.startswith(('http://', 'https://')) or not (offset.isdigit() and limit.isdigit() and int(limit) > 0):
+            rest = self._get_collection_paginated(next_href, params, max_pages - 1, out_dict, key_fn)
+            return all_items + rest if out_dict is None else out_dict
+        offset, limit = int(offset), int(limit)
+
+        def _fetch_page(page):
+            page_offset = offset + page * limit
+            collection, next_href = self._collection_page(self._get(next_path, {**next_query, 'offset': page_offset}))
+            return collection, page_offset, self._split_next_href(next_href)[1]
+
+        page, remaining = 0, max_pages - 1
+        executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+        try:
+            while remaining > 0:
+                batch = range(page, page + min(_MAX_WORKERS, remaining))
+                for collection, page_offset, page_query in executor.map(_fetch_page, batch):
+                    self._add_items(collection, all_items, out_dict, key_fn)
+                    if self._is_last_page(collection, page_offset, page_query, limit):
+                        # Last page reached; anything fetched past it in this batch is discarded
+                        return result
+                page += len(batch)
+                remaining -= len(batch)
+            return result
+        finally:
+            # On the last page or a failed page, drop queued pages and don't wait for speculative requests still in flight
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _add_items(collection, all_items, out_dict, key_fn):
+        # Malformed entries (non-dicts, no id) are dropped by the same generator that feeds the list/dict, not per-item branches
+        items = (i for i in collection if isinstance(i, dict) and 'id' in i)
+        if out_dict is None:
+            all_items.extend(items)
+        else:
+            out_dict.update((key_fn(i), i) for i in items)
+
+    def _split_next_href(self, next_href):
+        """Parse a next_href once into (path relative to api_base, query dict), so follow-up pages go through _get with params
+        like the first page; (None, None) when there is no next page. URLs on other hosts are kept whole."""
+        if not next_href:
+            return None, None
+        parts = urlsplit(next_href)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        if next_href.startswith(self.api_base):
+            return parts.path.lstrip('/'), query
+        return next_href, query
+
+    @staticmethod
+    def _is_last_page(collection, page_offset, next_query, limit):
+        # next_query is None when there is no next_href. api-v2 filters collections server-side and can return a short or even
+        # empty page mid-collection with a valid next_href, so a short page alone doesn't end pagination: it only does when
+        # next_href's numeric offset is page_offset + len(collection), i.e. nothing was filtered out of it. Otherwise (including
+        # opaque cursors) next_href is followed as before, at the cost of one extra request for the trailing empty page
+        if next_query is None:
+            return True
+        next_limit = next_query.get('limit', '')
+        if len(collection) >= (int(next_limit) if next_limit.isdigit() else int(limit)):
+            return False
+        next_offset, page_offset = next_query.get('offset', ''), str(page_offset)
+        return next_offset.isdigit() and page_offset.isdigit() and int(next_offset) == int(page_offset) + len(collection)
+
+    @staticmethod
+    def _collection_page(resp):
+        """Split a collection response into (items, next_href); handles both list responses and dicts with collection/next_href."""
+        if isinstance(resp, list):
+            return resp, None
+        if isinstance(resp, dict):
+            return resp.get('collection', []), resp.get('next_href')
+        return [], None
+
+
+    def get_track(self, track_id):
+        """Fetch a track object, reusing results from the last 10 minutes (retries and re-queued downloads)."""
+        track_id = str(track_id)
+        track_data = self._track_cache.get(track_id)
+        if track_data is None:
+            track_data = self._get(f'tracks/{track_id}')
+            self._track_cache.set(track_id, track_data)
+        return track_data
 
 
     def get_track_download(self, track_id):
@@ -76,15 +258,15 @@ class SoundCloudWebAPI:
     def get_track_stream_link(self, file_url, access_token): # Why does strip/lstrip not work here...?
         if not file_url or not isinstance(file_url, str):
             raise self.exception("Stream URL is missing. This track may not be available for streaming or download in your region.")
-        if 'https://api-v2.soundcloud.com/' not in file_url:
+        if not file_url.startswith(self.api_base):
             raise self.exception("Invalid stream URL. This track may not be available.")
-        return self._get(file_url.split('https://api-v2.soundcloud.com/')[1], {'track_authorization': access_token})['url']
+        return self._get(file_url.removeprefix(self.api_base), {'track_authorization': access_token})['url']
 
     def get_preview_stream_url(self, track_id, track_authorization=None):
         """Get a direct stream URL for preview playback."""
         try:
             # Get track data to find transcodings
-            track_data = self._get(f'tracks/{track_id}')
+            track_data = self.get_track(track_id)
             
             if not track_data.get('streamable'):
                 return None
@@ -96,31 +278,20 @@ class SoundCloudWebAPI:
             # Use track_authorization from track_data if not provided
             auth = track_authorization or track_data.get('track_authorization', '')
             
-            # Find best stream for preview (prefer progressive over HLS)
-            best_url = None
+            # Find best stream for preview (prefer progressive over HLS): first URL per protocol, in one pass
+            buckets = {}
             for transcoding in transcodings:
-                protocol = transcoding.get('format', {}).get('protocol', '')
                 url = transcoding.get('url', '')
-                
                 if url:
-                    if protocol == 'progressive':
-                        # Progressive is preferred, resolve and return immediately
-                        try:
-                            resolved_url = self.get_track_stream_link(url, auth)
-                            return resolved_url
-                        except:
-                            continue
-                    elif protocol == 'hls' and not best_url:
-                        # Store HLS as fallback
-                        best_url = url
+                    buckets.setdefault(transcoding.get('format', {}).get('protocol', ''), url)
             
-            # If only HLS available, try to resolve it
-            if best_url:
-                try:
-                    resolved_url = self.get_track_stream_link(best_url, auth)
-                    return resolved_url
-                except:
-                    pass
+            # Progressive first, HLS as fallback
+            for url in (buckets.get('progressive'), buckets.get('hls')):
+                if url:
+                    try:
+                        return self.get_track_stream_link(url, auth)
+                    except (self.exception, KeyError, ValueError):
+                        continue
             
             return None
         except Exception as e:
@@ -133,7 +304,26 @@ class SoundCloudWebAPI:
         return self._get('me')
 
     def resolve_url(self, url):
-        return self._get('resolve', {'url': url})
+        resolved = self._resolve_cache.get(url)
+        if resolved is None:
+            resolved = self._get('resolve', {'url': url})
+            self._resolve_cache.set(url, resolved)
+        return resolved
+
+    def resolve_urls(self, urls):
+        """Resolve many URLs in parallel into {url: resolved}, leaving out ones that fail. Results land in the resolve_url cache,
+        so warming it with https://soundcloud.com/{permalink} URLs turns later get_user_albums_tracks(permalink) resolves into cache hits."""
+        def _resolve(url):
+            try:
+                return url, self.resolve_url(url)
+            except Exception:
+                return url, None
+
+        urls = list(dict.fromkeys(urls))
+        if len(urls) <= 1:
+            return {url: resolved for url, resolved in map(_resolve, urls) if resolved is not None}
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            return {url: resolved for url, resolved in executor.map(_resolve, urls) if resolved is not None}
 
 
     def search(self, query_type, query, limit = 10):
@@ -144,33 +334,33 @@ class SoundCloudWebAPI:
         # Prefer numeric id; resolve permalink to id when user_id is non-numeric
         uid = user_id
         if isinstance(uid, str) and not uid.isdigit():
-            try:
-                resolved = self._get('resolve', {'url': f'https://soundcloud.com/{uid}'})
-                if isinstance(resolved, dict):
-                    uid = resolved.get('id') or (resolved.get('urn') or '').split(':')[-1] or uid
-                else:
-                    uid = getattr(resolved, 'id', uid)
-            except Exception:
-                pass
+            if uid in self._uid_cache:
+                uid = self._uid_cache[uid]
+            else:
+                try:
+                    resolved = self.resolve_url(f'https://soundcloud.com/{uid}')
+                    if isinstance(resolved, dict):
+                        uid = resolved.get('id') or (resolved.get('urn') or '').split(':')[-1] or uid
+                    else:
+                        uid = getattr(resolved, 'id', uid)
+                    self._uid_cache[user_id] = uid
+                except Exception:
+                    pass
         uid = str(uid) if uid is not None else str(user_id)
         # Request without linked_partitioning; handle list or dict response and paginate via next_href
         album_err = None
         track_err = None
+        # Albums and tracks are independent collections, so page through both at the same time, straight into their dicts
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            album_future = executor.submit(self._get_collection_concurrent, f'users/{uid}/albums', {'limit': 200}, out_dict={})
+            track_future = executor.submit(self._get_collection_concurrent, f'users/{uid}/tracks', {'limit': 200}, out_dict={})
         try:
-            album_items = self._get_collection_paginated(
-                f'users/{uid}/albums',
-                {'limit': 200}
-            )
-            album_data = {i['id']: i for i in album_items}
+            album_data = album_future.result()
         except Exception as e:
             album_data = {}
             album_err = e
         try:
-            track_items = self._get_collection_paginated(
-                f'users/{uid}/tracks',
-                {'limit': 200}
-            )
-            track_data = {i['id']: i for i in track_items}
+            track_data = track_future.result()
         except Exception as e:
             track_data = {}
             track_err = e
@@ -182,29 +372,19 @@ class SoundCloudWebAPI:
         # In case /tracks returns a restricted error, attempt fallback endpoints
         if track_err and _is_restricted(track_err):
             try:
-                fallback_items = []
-                try:
-                    toptracks = self._get_collection_paginated(f'users/{uid}/toptracks', {'limit': 200})
-                    for item in toptracks:
-                        if 'track' in item:
-                            fallback_items.append(item['track'])
-                        elif 'id' in item:
-                            fallback_items.append(item)
-                except Exception:
-                    pass
+                # Unwrap {'track': ...} entries and keep only usable tracks as they are collected
+                fallback_data = {}
+                for endpoint in ('toptracks', 'spotlight'):
+                    try:
+                        for item in self._get_collection_paginated(f'users/{uid}/{endpoint}', {'limit': 200}):
+                            track = item['track'] if 'track' in item else item
+                            if isinstance(track, dict) and 'id' in track:
+                                fallback_data[track['id']] = track
+                    except Exception:
+                        pass
                 
-                try:
-                    spotlight = self._get_collection_paginated(f'users/{uid}/spotlight', {'limit': 200})
-                    for item in spotlight:
-                        if 'track' in item:
-                            fallback_items.append(item['track'])
-                        elif 'id' in item:
-                            fallback_items.append(item)
-                except Exception:
-                    pass
-                
-                if fallback_items:
-                    track_data = {i['id']: i for i in fallback_items if 'id' in i}
+                if fallback_data:
+                    track_data = fallback_data
                     track_err = None
                     # print(f"[SoundCloud] User uid={uid}: /tracks restricted, used fallback endpoints (recovered {len(track_data)} tracks).")
             except Exception:
@@ -223,8 +403,31 @@ class SoundCloudWebAPI:
         return album_data, track_data
     
 
+    def get_tracks_batch(self, track_ids):
+        """Fetch full track objects for many ids through the tracks?ids= batch endpoint (50 ids per request, up to _MAX_WORKERS requests in parallel)."""
+        track_ids = [str(i) for i in track_ids]
+        tracks_to_get_chunked = [track_ids[i:i + 50] for i in range(0, len(track_ids), 50)]
+        if len(tracks_to_get_chunked) <= 1:
+            results = [self._get_tracks_by_ids(i) for i in tracks_to_get_chunked]
+        else:
+            # Chunks are independent GETs on the same keep-alive pool; map keeps them in order
+            with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+                results = list(executor.map(self._get_tracks_by_ids, tracks_to_get_chunked))
+        return {j['id']: j for j in chain.from_iterable(results)}
+
+    def _get_tracks_by_ids(self, id_strings):
+        # Fast path for tracklist hydration: numeric ids and commas need no query encoding, so skip building/encoding params
+        return self._get(self._tracks_by_ids_url + ','.join(id_strings))
+
     def get_tracks_from_tracklist(self, track_data): # WHY?! Only the web player's api-v2 needs this garbage, not api or api-mobile
-        tracks_to_get = [str(i['id']) for i in track_data if 'streamable' not in i]
-        tracks_to_get_chunked = [tracks_to_get[i:i + 50] for i in range(0, len(tracks_to_get), 50)]
-        new_track_data = {j['id']: j for j in sum([self._get('tracks', {'ids': ','.join(i)}) for i in tracks_to_get_chunked], [])}
-        return {i['id']: (i if 'streamable' in i else new_track_data[i['id']]) for i in track_data}
+        # Single pass: keep tracklist order in result and collect the stubs to hydrate. Also prefetch tracks without
+        # transcodings, otherwise get_track_info would fetch each of them on its own
+        result, tracks_to_get = {}, []
+        for i in track_data:
+            result[i['id']] = i
+            if 'streamable' not in i or not i.get('media', {}).get('transcodings'):
+                tracks_to_get.append(i['id'])
+        if tracks_to_get:
+            # Replacing existing keys keeps their position; stubs the batch endpoint left out stay as they are
+            result.update((k, v) for k, v in self.get_tracks_batch(tracks_to_get).items() if k in result)
+        return result